@@ -1,17 +1,26 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, Response
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.formparsers import MultiPartParser
 import os
+import mmap
+import sqlite3
+import asyncio
+import threading
 import logging
-import json
+import re
+import time
 import uuid
+import hashlib
 from datetime import datetime, timedelta
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List, Optional
-import shutil
+import orjson
+from pydantic import BaseModel, Field, TypeAdapter
+from typing import Dict, List, Optional, Tuple
+import queue
 import jwt
 from passlib.context import CryptContext
 
@@ -25,24 +34,108 @@ DATA_DIR.mkdir(exist_ok=True)
 UPLOADS_DIR.mkdir(exist_ok=True)
 
 # File paths
-POSTS_FILE = DATA_DIR / "posts.json"
+POSTS_DB = DATA_DIR / "blog.db"
 USERS_FILE = DATA_DIR / "users.json"
 CONFIG_FILE = DATA_DIR / "config.json"
+# Earlier post stores, migrated into POSTS_DB on first start
+POSTS_FILE = DATA_DIR / "posts.json"
+POSTS_LOG = POSTS_FILE.with_suffix(".jsonl")
+
+# Posts database; writes go through the background writer task
+POSTS_DB_MMAP_SIZE = 256 * 1024 * 1024
+_db: Optional[sqlite3.Connection] = None
+_UPSERT_POST_SQL = """
+    INSERT INTO posts (id, slug, json, created_at, published) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        slug = excluded.slug,
+        json = excluded.json,
+        created_at = excluded.created_at,
+        published = excluded.published
+"""
+
+# In-memory posts store, loaded from POSTS_DB on startup
+POSTS_BY_ID: Dict[str, dict] = {}
+POSTS_BY_SLUG: Dict[str, dict] = {}
+# Precomputed listings, newest first; rebuilt on every post mutation
+_ALL_SORTED: List[dict] = []
+_PUBLISHED_SORTED: List[dict] = []
+# Serialized body of the unfiltered public listing
+_PUBLISHED_JSON = b"[]"
+# Serialized body and ETag of each post, keyed by post id
+_POST_BODIES: Dict[str, Tuple[bytes, str]] = {}
+
+# Post events waiting for the background writer, flushed in batches
+WRITE_BATCH_SIZE = 32
+WRITE_BATCH_DELAY = 0.05  # seconds
+_WRITE_QUEUE: asyncio.Queue = asyncio.Queue()
+_writer_task: Optional[asyncio.Task] = None
+
+# Users are loaded once at startup and kept in memory
+USERS: List[dict] = []
+USERS_BY_NAME: Dict[str, dict] = {}
+# Logins run in worker threads; serialises password rehashes and users.json rewrites
+_USERS_LOCK = threading.Lock()
+
+# Recent successful logins, keyed by (username, sha256(password), stored hash)
+LOGIN_CACHE_TTL = 60  # seconds
+LOGIN_CACHE_MAX_SIZE = 1024
+_LOGIN_CACHE: Dict[Tuple[str, str, str], float] = {}
+# authenticate_user runs in worker threads; guards the evict-then-insert below
+_LOGIN_CACHE_LOCK = threading.Lock()
+
+# Decoded JWT payloads, keyed by raw token, with the token's exp timestamp
+JWT_CACHE_MAX_SIZE = 10_000
+_JWT_CACHE: Dict[str, Tuple[dict, float]] = {}
+
+# Reusable copy buffers for image uploads
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MiB
+_UPLOAD_BUFFERS: queue.SimpleQueue = queue.SimpleQueue()
+# Uploads up to this size stay in memory instead of spilling to a temp file
+UPLOAD_SPOOL_MAX_SIZE = 16 * 1024 * 1024  # 16 MiB
+MultiPartParser.max_file_size = UPLOAD_SPOOL_MAX_SIZE
+
+# Slug normalization patterns
+_SLUG_STRIP = re.compile(r'[^a-z0-9\s-]')
+_SLUG_WS = re.compile(r'\s+')
+
+# Accepted schemes for external image URLs
+_HTTP_PFX = ('http://', 'https://')
 
 # Security
 SECRET_KEY = "your-secret-key-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2id for new hashes; bcrypt hashes still verify and are upgraded on login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__time_cost=2,
+    argon2__memory_cost=19456,
+    argon2__parallelism=1,
+)
 security = HTTPBearer()
 
 # Create the main app
-app = FastAPI()
+# Run with: uvicorn server:app --loop uvloop --http httptools
+# Keep a single worker: posts and users live in this process's memory.
+app = FastAPI(default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api")
 
-# Serve uploaded images
-app.mount("/uploads", StaticFiles(directory=str(UPLOADS_DIR)), name="uploads")
+# Serve uploaded images. StaticFiles streams file chunks through Python; behind
+# nginx, set UPLOADS_ACCEL_PREFIX to hand the transfer to nginx's sendfile(2):
+#   location /_uploads/ { internal; alias /app/backend/uploads/; }
+UPLOADS_ACCEL_PREFIX = os.environ.get("UPLOADS_ACCEL_PREFIX")
+
+if UPLOADS_ACCEL_PREFIX:
+    @app.get("/uploads/{filename}", include_in_schema=False)
+    async def serve_upload(filename: str):
+        if filename.startswith("."):
+            raise HTTPException(status_code=404, detail="Not Found")
+        return Response(headers={"X-Accel-Redirect": f"{UPLOADS_ACCEL_PREFIX.rstrip('/')}/{filename}"})
+else:
+    app.mount("/uploads", StaticFiles(directory=str(UPLOADS_DIR)), name="uploads")
 
 # Models
 class BlogPost(BaseModel):
@@ -60,6 +153,8 @@ class BlogPost(BaseModel):
     meta_title: Optional[str] = None
     meta_description: Optional[str] = None
 
+_POST_LIST_ADAPTER = TypeAdapter(List[BlogPost])
+
 class BlogPostCreate(BaseModel):
     title: str
     content: str
@@ -90,21 +185,191 @@ class Token(BaseModel):
 
 # Utility functions
 def load_json_file(file_path: Path) -> list:
-    if file_path.exists():
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    return []
+    try:
+        return orjson.loads(file_path.read_bytes())
+    except FileNotFoundError:
+        return []
+
+def load_json_mmap(file_path: Path) -> list:
+    """Parse a JSON file straight from a read-only memory map"""
+    try:
+        f = open(file_path, 'rb')
+    except FileNotFoundError:
+        return []
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return orjson.loads(view)
+
+def iter_jsonl_mmap(file_path: Path):
+    """Yield the lines of a JSONL file through a read-only memory map"""
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b'')
 
 def save_json_file(file_path: Path, data: list):
-    with open(file_path, 'w') as f:
-        json.dump(data, f, default=str, indent=2)
+    """Write a JSON file atomically, so a crash never leaves it truncated"""
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+def open_posts_db(path: Path = POSTS_DB) -> sqlite3.Connection:
+    """Open the posts database, creating the schema on first use"""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA mmap_size={POSTS_DB_MMAP_SIZE}")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS posts (
+            id TEXT PRIMARY KEY,
+            slug TEXT NOT NULL UNIQUE,
+            json TEXT NOT NULL,
+            created_at TEXT,
+            published INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_pub_created ON posts(published, created_at DESC);
+    """)
+    return conn
+
+def replay_posts_log(file_path: Path) -> Dict[str, dict]:
+    """Rebuild posts from the JSONL event log used by earlier versions"""
+    posts = {}
+    for line in iter_jsonl_mmap(file_path):
+        if not line.strip():
+            continue
+        try:
+            event = orjson.loads(line)
+        except ValueError:
+            # Torn trailing write from a crash; everything before it is intact
+            break
+        if event["op"] == "upsert":
+            posts[event["post"]["id"]] = event["post"]
+        elif event["op"] == "delete":
+            posts.pop(event["id"], None)
+    return posts
+
+def migrate_posts():
+    """Seed POSTS_DB from the JSONL log, or from the original posts.json"""
+    if POSTS_LOG.exists():
+        posts = replay_posts_log(POSTS_LOG)
+    else:
+        posts = {p["id"]: p for p in load_json_mmap(POSTS_FILE)}
+
+    # Build the database aside and rename it in, so a failed import leaves no
+    # half-seeded POSTS_DB behind and the next start migrates again
+    tmp_db = POSTS_DB.with_name(POSTS_DB.name + ".tmp")
+    for leftover in (tmp_db, tmp_db.with_name(tmp_db.name + "-wal"), tmp_db.with_name(tmp_db.name + "-shm")):
+        leftover.unlink(missing_ok=True)
+    conn = open_posts_db(tmp_db)
+    try:
+        with conn:
+            conn.executemany(_UPSERT_POST_SQL, (upsert_event(p)["row"] for p in posts.values()))
+    finally:
+        conn.close()
+    os.replace(tmp_db, POSTS_DB)
+
+def load_posts():
+    """Load every post from the database into POSTS_BY_ID"""
+    global _db
+    if not POSTS_DB.exists():
+        migrate_posts()
+    _db = open_posts_db()
+    POSTS_BY_ID.clear()
+    for (data,) in _db.execute("SELECT json FROM posts"):
+        post = orjson.loads(data)
+        POSTS_BY_ID[post["id"]] = post
+    reindex_posts()
+    rebuild_views()
+
+def reindex_posts():
+    """Rebuild POSTS_BY_SLUG and the cached post bodies from POSTS_BY_ID"""
+    POSTS_BY_SLUG.clear()
+    _POST_BODIES.clear()
+    for post in POSTS_BY_ID.values():
+        POSTS_BY_SLUG[post["slug"]] = post
+        cache_post_body(post)
+
+def cache_post_body(post: dict):
+    """Serialize a post once per write, with an ETag for conditional GETs"""
+    body = orjson.dumps(post, default=str)
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    _POST_BODIES[post["id"]] = (body, etag)
+
+def rebuild_views():
+    """Recompute the sorted post listings served by the read endpoints"""
+    global _ALL_SORTED, _PUBLISHED_SORTED, _PUBLISHED_JSON
+    _ALL_SORTED = sorted(POSTS_BY_ID.values(), key=lambda x: x.get("created_at", ""), reverse=True)
+    _PUBLISHED_SORTED = [p for p in _ALL_SORTED if p.get("published", False)]
+    # Same bytes response_model=List[BlogPost] would produce, built once per write
+    _PUBLISHED_JSON = _POST_LIST_ADAPTER.dump_json(_POST_LIST_ADAPTER.validate_python(_PUBLISHED_SORTED))
+
+def upsert_event(post: dict) -> dict:
+    """Snapshot a post as a posts row at the moment it was mutated"""
+    row = (
+        post["id"],
+        post["slug"],
+        orjson.dumps(post, default=str).decode(),
+        post.get("created_at"),
+        int(post.get("published", False)),
+    )
+    return {"op": "upsert", "row": row}
+
+def write_post_events(events: List[dict]):
+    """Apply a batch of post mutations to the database in one transaction"""
+    with _db:
+        for event in events:
+            if event["op"] == "upsert":
+                _db.execute(_UPSERT_POST_SQL, event["row"])
+            elif event["op"] == "delete":
+                _db.execute("DELETE FROM posts WHERE id = ?", (event["id"],))
+
+async def post_db_writer():
+    """Drain _WRITE_QUEUE, persisting up to WRITE_BATCH_SIZE events per transaction"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _WRITE_QUEUE.get()]
+        deadline = loop.time() + WRITE_BATCH_DELAY
+        while len(batch) < WRITE_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_WRITE_QUEUE.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            await asyncio.to_thread(write_post_events, batch)
+        except Exception:
+            logger.exception("Failed to persist %d post events", len(batch))
+        finally:
+            for _ in batch:
+                _WRITE_QUEUE.task_done()
+
+def copy_upload(src, dest: Path):
+    """Copy an uploaded file to dest through a pooled buffer"""
+    try:
+        buf = _UPLOAD_BUFFERS.get_nowait()
+    except queue.Empty:
+        buf = bytearray(UPLOAD_CHUNK_SIZE)
+    view = memoryview(buf)
+    try:
+        with open(dest, 'wb') as out:
+            while n := src.readinto(buf):
+                out.write(view[:n])
+    finally:
+        view.release()
+        _UPLOAD_BUFFERS.put(buf)
 
 def create_slug(title: str) -> str:
     """Create a URL-friendly slug from title"""
-    import re
-    slug = title.lower()
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-    slug = re.sub(r'\s+', '-', slug)
+    slug = _SLUG_STRIP.sub('', title.lower())
+    slug = _SLUG_WS.sub('-', slug)
     return slug.strip('-')
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -117,17 +382,36 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+def verify_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password, also returning a replacement hash if the scheme is outdated"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 def authenticate_user(username: str, password: str):
-    users = load_json_file(USERS_FILE)
-    user = next((u for u in users if u["username"] == username), None)
-    if not user or not verify_password(password, user["password"]):
+    user = USERS_BY_NAME.get(username)
+    if not user:
         return False
+
+    password_digest = hashlib.sha256(password.encode()).hexdigest()
+    key = (username, password_digest, user["password"])
+    expires = _LOGIN_CACHE.get(key)
+    if expires is None or expires < time.monotonic():
+        verified, new_hash = verify_password(password, user["password"])
+        if not verified:
+            return False
+        if new_hash:
+            with _USERS_LOCK:
+                # Another login may have upgraded the hash while this one verified
+                if user["password"] == key[2]:
+                    user["password"] = new_hash
+                    save_json_file(USERS_FILE, USERS)
+            key = (username, password_digest, user["password"])
+        with _LOGIN_CACHE_LOCK:
+            if len(_LOGIN_CACHE) >= LOGIN_CACHE_MAX_SIZE:
+                _LOGIN_CACHE.pop(next(iter(_LOGIN_CACHE)), None)
+            _LOGIN_CACHE[key] = time.monotonic() + LOGIN_CACHE_TTL
     return user
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
@@ -136,39 +420,65 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         detail="Invalid authentication credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
+    token = credentials.credentials
+    cached = _JWT_CACHE.get(token)
+    if cached and cached[1] > time.time():
+        payload = cached[0]
+    else:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except jwt.PyJWTError:
+            _JWT_CACHE.pop(token, None)
             raise credentials_exception
-    except jwt.PyJWTError:
+        if len(_JWT_CACHE) >= JWT_CACHE_MAX_SIZE:
+            _JWT_CACHE.pop(next(iter(_JWT_CACHE)), None)
+        _JWT_CACHE[token] = (payload, payload.get("exp", 0))
+
+    username: str = payload.get("sub")
+    if username is None:
         raise credentials_exception
     
-    users = load_json_file(USERS_FILE)
-    user = next((u for u in users if u["username"] == username), None)
+    user = USERS_BY_NAME.get(username)
     if user is None:
         raise credentials_exception
     return user
 
 # Initialize default admin user if not exists
 def init_default_user():
-    users = load_json_file(USERS_FILE)
-    if not users:
+    USERS[:] = load_json_file(USERS_FILE)
+    if not USERS:
         default_user = {
             "id": str(uuid.uuid4()),
             "username": "admin",
             "password": get_password_hash("admin123"),
             "created_at": datetime.utcnow().isoformat()
         }
-        save_json_file(USERS_FILE, [default_user])
+        USERS.append(default_user)
+        save_json_file(USERS_FILE, USERS)
+    USERS_BY_NAME.clear()
+    USERS_BY_NAME.update((u["username"], u) for u in USERS)
 
 # Initialize on startup
 init_default_user()
+load_posts()
+
+@app.on_event("startup")
+async def start_post_writer():
+    global _writer_task
+    _writer_task = asyncio.create_task(post_db_writer())
+
+@app.on_event("shutdown")
+async def stop_post_writer():
+    # Flush pending mutations before exiting
+    await _WRITE_QUEUE.join()
+    _writer_task.cancel()
+    _db.close()
 
 # Routes
 @api_router.post("/login", response_model=Token)
 async def login(login_request: LoginRequest):
-    user = authenticate_user(login_request.username, login_request.password)
+    # bcrypt verification is deliberately slow; keep it off the event loop
+    user = await asyncio.to_thread(authenticate_user, login_request.username, login_request.password)
     if not user:
         raise HTTPException(
             status_code=401,
@@ -183,9 +493,10 @@ async def login(login_request: LoginRequest):
 
 @api_router.get("/posts", response_model=List[BlogPost])
 async def get_posts(published_only: bool = True, search: Optional[str] = None, tag: Optional[str] = None):
-    posts = load_json_file(POSTS_FILE)
-    if published_only:
-        posts = [p for p in posts if p.get("published", False)]
+    if published_only and not search and not tag:
+        return Response(_PUBLISHED_JSON, media_type="application/json")
+
+    posts = _PUBLISHED_SORTED if published_only else _ALL_SORTED
     
     # Apply search filter
     if search:
@@ -199,97 +510,106 @@ async def get_posts(published_only: bool = True, search: Optional[str] = None, t
     if tag:
         posts = [p for p in posts if tag.lower() in [t.lower() for t in p.get("tags", [])]]
     
-    # Sort by created_at desc
-    posts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    # Filters preserve the newest-first order of the precomputed views
     return posts
 
 @api_router.get("/tags")
 async def get_all_tags():
-    posts = load_json_file(POSTS_FILE)
     all_tags = set()
-    for post in posts:
-        if post.get("published", False):
-            all_tags.update(post.get("tags", []))
+    for post in _PUBLISHED_SORTED:
+        all_tags.update(post.get("tags", []))
     return {"tags": sorted(list(all_tags))}
 
 @api_router.get("/posts/{slug}")
-async def get_post_by_slug(slug: str):
-    posts = load_json_file(POSTS_FILE)
-    post = next((p for p in posts if p["slug"] == slug), None)
+async def get_post_by_slug(slug: str, request: Request):
+    post = POSTS_BY_SLUG.get(slug)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return post
+
+    body, etag = _POST_BODIES[post["id"]]
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60"}
+    if_none_match = request.headers.get("if-none-match")
+    # "*" matches any current representation, so an existing post is always unchanged
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or etag in (t.strip().removeprefix("W/") for t in if_none_match.split(","))
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 @api_router.get("/admin/posts", response_model=List[BlogPost])
 async def get_admin_posts(current_user: dict = Depends(get_current_user)):
-    posts = load_json_file(POSTS_FILE)
-    posts.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-    return posts
+    return _ALL_SORTED
 
 @api_router.post("/admin/posts", response_model=BlogPost)
 async def create_post(post_data: BlogPostCreate, current_user: dict = Depends(get_current_user)):
-    posts = load_json_file(POSTS_FILE)
-    
     # Create slug from title
     slug = create_slug(post_data.title)
     
     # Ensure slug is unique
-    existing_slugs = [p["slug"] for p in posts]
     original_slug = slug
     counter = 1
-    while slug in existing_slugs:
+    while slug in POSTS_BY_SLUG:
         slug = f"{original_slug}-{counter}"
         counter += 1
     
-    # Create new post
-    new_post = BlogPost(
+    # Create new post; post_data is already validated, so skip re-validation
+    new_post = BlogPost.model_construct(
         slug=slug,
-        **post_data.dict()
+        **post_data.model_dump()
     )
     
-    posts.append(new_post.dict())
-    save_json_file(POSTS_FILE, posts)
-    return new_post
+    post = new_post.model_dump(mode="json")
+    POSTS_BY_ID[post["id"]] = post
+    POSTS_BY_SLUG[post["slug"]] = post
+    cache_post_body(post)
+    rebuild_views()
+    _WRITE_QUEUE.put_nowait(upsert_event(post))
+    return post
 
 @api_router.put("/admin/posts/{post_id}", response_model=BlogPost)
 async def update_post(post_id: str, post_data: BlogPostUpdate, current_user: dict = Depends(get_current_user)):
-    posts = load_json_file(POSTS_FILE)
-    post_index = next((i for i, p in enumerate(posts) if p["id"] == post_id), None)
+    post = POSTS_BY_ID.get(post_id)
     
-    if post_index is None:
+    if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
     
     # Update post
-    post = posts[post_index]
-    update_data = post_data.dict(exclude_unset=True)
+    update_data = post_data.model_dump(exclude_unset=True)
     
     # Update slug if title changed
     if "title" in update_data:
         new_slug = create_slug(update_data["title"])
-        existing_slugs = [p["slug"] for i, p in enumerate(posts) if i != post_index]
         original_slug = new_slug
         counter = 1
-        while new_slug in existing_slugs:
+        # The post may keep its own slug
+        while new_slug in POSTS_BY_SLUG and POSTS_BY_SLUG[new_slug] is not post:
             new_slug = f"{original_slug}-{counter}"
             counter += 1
         update_data["slug"] = new_slug
     
     update_data["updated_at"] = datetime.utcnow().isoformat()
+    old_slug = post["slug"]
     post.update(update_data)
+    if post["slug"] != old_slug:
+        del POSTS_BY_SLUG[old_slug]
+        POSTS_BY_SLUG[post["slug"]] = post
+    cache_post_body(post)
+    rebuild_views()
     
-    save_json_file(POSTS_FILE, posts)
-    return BlogPost(**post)
+    _WRITE_QUEUE.put_nowait(upsert_event(post))
+    return post
 
 @api_router.delete("/admin/posts/{post_id}")
 async def delete_post(post_id: str, current_user: dict = Depends(get_current_user)):
-    posts = load_json_file(POSTS_FILE)
-    post_index = next((i for i, p in enumerate(posts) if p["id"] == post_id), None)
-    
-    if post_index is None:
+    post = POSTS_BY_ID.pop(post_id, None)
+    if post is None:
         raise HTTPException(status_code=404, detail="Post not found")
+    del POSTS_BY_SLUG[post["slug"]]
+    del _POST_BODIES[post_id]
+    rebuild_views()
     
-    posts.pop(post_index)
-    save_json_file(POSTS_FILE, posts)
+    _WRITE_QUEUE.put_nowait({"op": "delete", "id": post_id})
     return {"message": "Post deleted successfully"}
 
 class ImageUploadRequest(BaseModel):
@@ -306,9 +626,12 @@ async def upload_image(file: UploadFile = File(None), current_user: dict = Depen
     unique_filename = f"{uuid.uuid4()}.{file_extension}"
     file_path = UPLOADS_DIR / unique_filename
     
-    # Save file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save file; spooled uploads are still in memory and need a single write
+    if file.size is not None and file.size <= UPLOAD_SPOOL_MAX_SIZE:
+        data = await file.read()
+        await asyncio.to_thread(file_path.write_bytes, data)
+    else:
+        await asyncio.to_thread(copy_upload, file.file, file_path)
     
     # Return URL
     return {"url": f"/uploads/{unique_filename}"}
@@ -316,7 +639,7 @@ async def upload_image(file: UploadFile = File(None), current_user: dict = Depen
 @api_router.post("/admin/save-image-url")
 async def save_image_url(image_data: ImageUploadRequest, current_user: dict = Depends(get_current_user)):
     # Validate URL format
-    if not image_data.image_url.startswith(('http://', 'https://')):
+    if not image_data.image_url.startswith(_HTTP_PFX):
         raise HTTPException(status_code=400, detail="Invalid URL format")
     
     # Return the URL directly for external images